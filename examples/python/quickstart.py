@@ -9,12 +9,27 @@ This example demonstrates the basic workflow:
 4. View results with Context Rail
 """
 
+import asyncio
 import os
-import time
 from sens import SensClient
 from sens.exceptions import SensError
 
 
+async def run_queries(client, queries, document_ids):
+    """Send independent queries concurrently and return results in order.
+
+    Failed queries come back as exception instances instead of cancelling the rest.
+    """
+    try:
+        return await asyncio.gather(
+            *(client.query_async(q, document_ids=document_ids) for q in queries),
+            return_exceptions=True,
+        )
+    finally:
+        # The async client is bound to this event loop, which asyncio.run() closes.
+        await client.aclose()
+
+
 def main():
     """Run the Sens Prism quickstart example."""
 
@@ -70,21 +85,17 @@ def main():
 
     # Step 2: Wait for document to be processed
     print("\n--- Waiting for Processing ---")
-    max_wait = 60
-    waited = 0
-    while waited < max_wait:
-        doc_status = client.get_document(doc.id)
-        print(f"  Status: {doc_status.status}")
-
-        if doc_status.status == "ready":
-            print("✓ Document ready to query!")
-            break
-        elif doc_status.status == "failed":
-            print("✗ Document processing failed")
-            return
-        else:
-            time.sleep(2)
-            waited += 2
+    # Backs off 0.5s, 1s, 2s, 4s, 8s, 8s, ... between checks if the API doesn't long-poll
+    doc_status = client.wait_for_document(doc.id, timeout=60, initial_delay=0.5, max_delay=8.0)
+    print(f"  Status: {doc_status.status}")
+
+    if doc_status.status == "failed":
+        print("✗ Document processing failed")
+        return
+    elif doc_status.status != "ready":
+        print("✗ Timed out waiting for document")
+        return
+    print("✓ Document ready to query!")
 
     # Step 3: Query the document
     print("\n--- Querying Document ---")
@@ -95,7 +106,8 @@ def main():
             query=query_text,
             document_ids=[doc.id],
             limit=3,
-            confidence_threshold=0.70
+            confidence_threshold=0.70,
+            include_context_rail=True,
         )
 
         print(f"Query: {query_text}")
@@ -111,7 +123,8 @@ def main():
     # Step 4: Get Context Rail for detailed information
     print("\n--- Context Rail Details ---")
     try:
-        context = client.get_context_rail(result.query_id)
+        # Embedded in the query response; fetch it separately only if it wasn't
+        context = result.context_rail or client.get_context_rail(result.query_id)
 
         print(f"Retrieved sources: {len(context.sources)}")
         for i, source in enumerate(context.sources, 1):
@@ -119,7 +132,7 @@ def main():
             print(f"  Document: {source.document_title}")
             if source.page:
                 print(f"  Page: {source.page}")
-            print(f"  Confidence: {source.confidence_score:.0%}")
+            print(f"  Confidence: {source.confidence_pct}%")
             if source.semantic_layer:
                 print(f"  Semantic Layer: {source.semantic_layer}")
             if source.matched_concepts:
@@ -138,14 +151,16 @@ def main():
         "How does Sens Prism protect data?",
     ]
 
-    for query_text in queries:
-        try:
-            result = client.query(query_text, document_ids=[doc.id])
-            print(f"\nQ: {query_text}")
-            print(f"A: {result.answer}")
-            print(f"  Confidence: {result.confidence_score:.0%}")
-        except SensError as e:
-            print(f"✗ Query failed: {e}")
+    results = asyncio.run(run_queries(client, queries, document_ids=[doc.id]))
+    for query_text, result in zip(queries, results):
+        if isinstance(result, SensError):
+            print(f"✗ Query failed: {result}")
+            continue
+        elif isinstance(result, BaseException):
+            raise result
+        print(f"\nQ: {query_text}")
+        print(f"A: {result.answer}")
+        print(f"  Confidence: {result.confidence_score:.0%}")
 
     # Cleanup
     print("\n--- Cleanup ---")
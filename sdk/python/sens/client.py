@@ -1,12 +1,48 @@
 """Sens Prism Python SDK client."""
 
 import asyncio
+import importlib.util
+import itertools
+import json
+import math
+import mimetypes
 import os
-from typing import List, Optional, Dict, Any
-from dataclasses import dataclass
+import random
+import socket
+import sys
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from operator import itemgetter
+from typing import (
+    List,
+    Optional,
+    Dict,
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Iterable,
+    Iterator,
+    Tuple,
+    Type,
+    Union,
+)
+from dataclasses import dataclass, field, fields
 
 import httpx
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - optional speedup
+    msgpack = None
+
 from sens.exceptions import (
     SensError,
     SensAuthError,
@@ -19,7 +55,12 @@ from sens.exceptions import (
 )
 
 
-@dataclass
+# Slotted dataclasses drop the per-instance __dict__, which adds up when a Context
+# Rail response carries hundreds of sources. dataclass() accepts slots= from 3.10.
+_DATACLASS_OPTIONS: Dict[str, Any] = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**_DATACLASS_OPTIONS)
 class Document:
     """Represents a document in Sens Prism."""
 
@@ -36,9 +77,13 @@ class Document:
     concept_count: Optional[int] = None
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class Source:
-    """Represents a source reference in query results."""
+    """Represents a source reference in query results.
+
+    ``confidence_pct`` is ``confidence_score`` as a whole percentage, worked out
+    once here so printing many sources doesn't reformat a float each time.
+    """
 
     document_id: str
     document_title: Optional[str] = None
@@ -48,9 +93,15 @@ class Source:
     semantic_layer: Optional[str] = None
     matched_concepts: Optional[List[str]] = None
     pragmatic_insights: Optional[List[str]] = None
+    confidence_pct: Optional[int] = field(default=None, init=False)
 
+    def __post_init__(self) -> None:
+        if self.confidence_score is not None:
+            # round() rather than int(): 0.94 * 100 is 93.99999999999999.
+            self.confidence_pct = round(self.confidence_score * 100)
 
-@dataclass
+
+@dataclass(**_DATACLASS_OPTIONS)
 class QueryResult:
     """Represents the result of a query."""
 
@@ -60,9 +111,10 @@ class QueryResult:
     confidence_score: float
     processing_time_ms: int
     sources: List[Source]
+    context_rail: Optional["ContextRail"] = None
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class ContextRail:
     """Represents detailed context information for a query."""
 
@@ -73,13 +125,306 @@ class ContextRail:
     summary: Dict[str, Any]
 
 
+# orjson decodes large Context Rail responses several times faster than the
+# stdlib; install ``sens-prism[speedups]`` to use it.
+if orjson is not None:
+    _json_loads = orjson.loads
+    _json_dumps = orjson.dumps
+else:
+    _json_loads = json.loads
+
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj).encode()
+
+
+# With msgpack installed, ask for MessagePack responses: Context Rail payloads repeat
+# the same keys for every source, which MessagePack encodes far more compactly.
+# Servers that don't offer it keep answering with JSON.
+_MSGPACK_TYPES = ("application/msgpack", "application/x-msgpack")
+_ACCEPT = (
+    "application/msgpack, application/json;q=0.9" if msgpack is not None else "application/json"
+)
+
+
+def _decode_body(response: httpx.Response) -> Any:
+    """Decode a response body as MessagePack or JSON, going by its Content-Type."""
+    content_type = response.headers.get("Content-Type", "").split(";")[0].strip()
+    if msgpack is not None and content_type in _MSGPACK_TYPES:
+        try:
+            return msgpack.unpackb(response.content, raw=False)
+        except (ValueError, msgpack.UnpackException) as e:
+            raise ValueError("Invalid MessagePack response body") from e
+    return _json_loads(response.content)
+
+
+# HTTP/2 multiplexes every request in a session over one connection, but httpx
+# only speaks it when the optional h2 package is installed (``sens-prism[http2]``).
+_HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+# Connection pool shared by all requests from a client, kept warm between calls.
+_POOL_LIMITS = httpx.Limits(
+    max_keepalive_connections=20,
+    max_connections=50,
+    keepalive_expiry=60,
+)
+
+# Exception raised for each HTTP error status, looked up once per failed request.
+_STATUS_ERRORS: Dict[int, Type[SensError]] = {
+    400: SensValidationError,
+    401: SensAuthError,
+    403: SensAuthError,
+    404: SensNotFoundError,
+    409: SensConflictError,
+    413: SensPayloadTooLargeError,
+}
+
+# Error statuses that carry a Retry-After header.
+_RETRY_AFTER_ERRORS: Dict[int, Type[Union[SensRateLimitError, SensServiceUnavailableError]]] = {
+    429: SensRateLimitError,
+    503: SensServiceUnavailableError,
+}
+
+# Most query results kept in memory when query_cache_ttl is set.
+_QUERY_CACHE_SIZE = 128
+
+# Document statuses are interned as responses are parsed, so comparing them with
+# these constants short-circuits on identity in polling loops.
+_READY = sys.intern("ready")
+_FAILED = sys.intern("failed")
+
+# Document statuses after which processing will not progress any further.
+_TERMINAL_STATUSES = (_READY, _FAILED)
+
+# Longest a single long-poll request asks the server to hold the connection.
+_MAX_SERVER_WAIT = 30
+
+
+def _parse_document(result: Dict[str, Any]) -> Document:
+    """Build a Document from an API response body."""
+    return Document(
+        id=result["id"],
+        status=sys.intern(result["status"]),
+        title=result.get("title"),
+        size_bytes=result.get("size_bytes"),
+        tags=result.get("tags"),
+        created_at=result.get("created_at"),
+        estimated_ready_at=result.get("estimated_ready_at"),
+        ready_at=result.get("ready_at"),
+        page_count=result.get("page_count"),
+        chunk_count=result.get("chunk_count"),
+        concept_count=result.get("concept_count"),
+    )
+
+
+# Source fields in constructor order. A single C-level itemgetter call pulls them
+# all out of a response dict, after filling in None for optional keys the server
+# left out; document_id has no default, so a source without one still fails loudly.
+_SOURCE_FIELDS = tuple(f.name for f in fields(Source) if f.init)
+_SOURCE_DEFAULTS = dict.fromkeys(_SOURCE_FIELDS[1:])
+_get_source_fields = itemgetter(*_SOURCE_FIELDS)
+
+
+def _parse_sources(items: Iterable[Dict[str, Any]]) -> List[Source]:
+    """Build Source objects from the ``sources`` array of an API response."""
+    return [Source(*_get_source_fields({**_SOURCE_DEFAULTS, **s})) for s in items]
+
+
+def _build_upload_data(title: Optional[str], tags: Optional[List[str]]) -> Dict[str, str]:
+    """Build the multipart form fields for a document upload."""
+    data = {}
+    if title:
+        data["title"] = title
+    if tags:
+        data["tags"] = ",".join(tags)
+    return data
+
+
+# Size of each read from disk while streaming an upload.
+_UPLOAD_CHUNK_SIZE = 64 * 1024
+
+
+# Escapes for quoted multipart header parameters, as in HTML5 form encoding (and
+# httpx): a filename with CR/LF must not be able to inject part headers.
+_FORM_PARAM_ESCAPES = {ord('"'): "%22", ord("\\"): "\\\\"}
+_FORM_PARAM_ESCAPES.update({c: f"%{c:02X}" for c in range(0x20) if c != 0x1B})
+
+
+class _MultipartBody:
+    """A multipart/form-data upload body that streams the file part from disk.
+
+    Only the form fields and part headers are held in memory. Each iteration reopens
+    the file, so the same body can be sent again if a request has to be repeated.
+    """
+
+    def __init__(self, file_path: str, size: int, fields: Dict[str, str]):
+        self.file_path = file_path
+        boundary = os.urandom(16).hex()
+        basename = os.path.basename(file_path)
+        filename = basename.translate(_FORM_PARAM_ESCAPES)
+        mimetype = mimetypes.guess_type(basename)[0] or "application/octet-stream"
+
+        parts = [
+            f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n'.encode()
+            + value.encode()
+            + b"\r\n"
+            for name, value in fields.items()
+        ]
+        parts.append(
+            f"--{boundary}\r\n"
+            f'Content-Disposition: form-data; name="file"; filename="{filename}"\r\n'
+            f"Content-Type: {mimetype}\r\n\r\n".encode()
+        )
+        self._head = b"".join(parts)
+        self._tail = f"\r\n--{boundary}--\r\n".encode()
+
+        # A known length lets the server reject an oversized body from the headers
+        # alone, before any of the file is sent.
+        self.headers = {
+            "Content-Type": f"multipart/form-data; boundary={boundary}",
+            "Content-Length": str(len(self._head) + size + len(self._tail)),
+        }
+
+
+class _SyncMultipartBody(_MultipartBody):
+    """Multipart upload body for the sync client."""
+
+    def __iter__(self) -> Iterator[bytes]:
+        yield self._head
+        with open(self.file_path, "rb") as f:
+            while chunk := f.read(_UPLOAD_CHUNK_SIZE):
+                yield chunk
+        yield self._tail
+
+
+class _AsyncMultipartBody(_MultipartBody):
+    """Multipart upload body for the async client.
+
+    Disk reads run in a worker thread so they don't block the event loop.
+    """
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        yield self._head
+        f = await asyncio.to_thread(open, self.file_path, "rb")
+        try:
+            while chunk := await asyncio.to_thread(f.read, _UPLOAD_CHUNK_SIZE):
+                yield chunk
+        finally:
+            f.close()
+        yield self._tail
+
+
+def _build_query_payload(
+    query: str,
+    document_ids: Optional[List[str]],
+    tags: Optional[List[str]],
+    limit: int,
+    confidence_threshold: float,
+    include_context_rail: bool,
+) -> Dict[str, Any]:
+    """Build the JSON body for a query request."""
+    payload: Dict[str, Any] = {
+        "query": query,
+        "limit": limit,
+        "confidence_threshold": confidence_threshold,
+    }
+
+    if document_ids:
+        payload["document_ids"] = document_ids
+    if tags:
+        payload["tags"] = tags
+    if include_context_rail:
+        payload["include_context_rail"] = True
+    return payload
+
+
+def _parse_context_rail(result: Dict[str, Any]) -> ContextRail:
+    """Build a ContextRail from an API response body."""
+    sources = _parse_sources(result.get("sources", ()))
+
+    return ContextRail(
+        query_id=result["query_id"],
+        query=result["query"],
+        retrieved_at=result["retrieved_at"],
+        sources=sources,
+        summary=result.get("summary", {}),
+    )
+
+
+def _parse_query_result(result: Dict[str, Any]) -> QueryResult:
+    """Build a QueryResult from an API response body."""
+    sources = _parse_sources(result.get("sources", ()))
+
+    context_rail = None
+    embedded = result.get("context_rail")
+    if embedded:
+        # The embedded rail may leave out what the enclosing query already says, and
+        # its retrieval time is then this response's.
+        defaults = {
+            "query_id": result["query_id"],
+            "query": result["query"],
+            "retrieved_at": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        }
+        context_rail = _parse_context_rail({**defaults, **embedded})
+
+    return QueryResult(
+        query_id=result["query_id"],
+        query=result["query"],
+        answer=result["answer"],
+        confidence_score=result["confidence_score"],
+        processing_time_ms=result["processing_time_ms"],
+        sources=sources,
+        context_rail=context_rail,
+    )
+
+
+def _parse_retry_after(value: Optional[str]) -> Optional[int]:
+    """Parse a Retry-After header into whole seconds from now.
+
+    Accepts delay-seconds (rounding fractions up) and HTTP-dates. Anything else
+    yields None, so the caller falls back to its own backoff.
+    """
+    if not value:
+        return None
+    try:
+        seconds = float(value)
+    except ValueError:
+        try:
+            retry_at = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if retry_at.tzinfo is None:
+            retry_at = retry_at.replace(tzinfo=timezone.utc)
+        seconds = (retry_at - datetime.now(timezone.utc)).total_seconds()
+    if not math.isfinite(seconds):
+        return None
+    return max(0, math.ceil(seconds))
+
+
+def _backoff_delays(initial_delay: float = 0.5, max_delay: float = 8.0) -> Iterator[float]:
+    """Yield capped exponential backoff delays (0.5s, 1s, 2s, 4s, 8s, 8s, ...) with jitter."""
+    for attempt in itertools.count():
+        delay = min(max_delay, initial_delay * 2**attempt)
+        yield random.uniform(0.8, 1.2) * delay
+
+
 class SensClient:
     """Client for interacting with Sens Prism API.
 
+    Requests share a persistent connection pool, so only the first call pays for
+    the TCP and TLS handshake. With ``sens-prism[http2]`` installed, requests are
+    multiplexed over a single HTTP/2 connection.
+
     Attributes:
         api_key: Your Sens Prism API key (format: sens_sk_...)
         base_url: Base URL for the API (default: https://api.sens.ai/v1)
         timeout: Request timeout in seconds (default: 30)
+        requests_per_minute: Default concurrency of gather_with_limit (default: 10)
+        max_retries: Retries for rate-limited or unavailable responses (default: 3)
+        backoff_cap: Longest wait in seconds before a retry (default: 30)
+        document_cache_ttl: Seconds a ready document is served from memory (default: 60)
+        max_upload_bytes: Largest file upload_document will send (default: 500 MB)
+        warmup: Whether to resolve the API host in the background (default: False)
+        query_cache_ttl: Seconds a query result is reused for an identical query (default: 0)
     """
 
     def __init__(
@@ -87,6 +432,13 @@ class SensClient:
         api_key: Optional[str] = None,
         base_url: str = "https://api.sens.ai/v1",
         timeout: int = 30,
+        requests_per_minute: int = 10,
+        max_retries: int = 3,
+        backoff_cap: float = 30.0,
+        document_cache_ttl: float = 60.0,
+        max_upload_bytes: Optional[int] = 500 * 1000 * 1000,
+        warmup: bool = False,
+        query_cache_ttl: float = 0.0,
     ):
         """Initialize the Sens Prism client.
 
@@ -94,6 +446,25 @@ class SensClient:
             api_key: Your API key. If not provided, reads from SENS_API_KEY env var.
             base_url: Base URL for the API.
             timeout: Request timeout in seconds.
+            requests_per_minute: Your plan's rate limit, used as the default
+                concurrency of gather_with_limit (default: 10, the Free plan).
+            max_retries: How many times to retry a request answered with 429 or 503
+                before raising. Set to 0 to disable retries.
+            backoff_cap: Upper bound in seconds on the wait before a retry. If the
+                server's Retry-After asks for longer, the error is raised instead.
+            document_cache_ttl: How long get_document answers from memory for a
+                document already seen as ready. Set to 0 to disable caching.
+            max_upload_bytes: Files larger than this are rejected before any data is
+                sent. Defaults to the Pro plan's per-file limit; set it to your plan's
+                limit, or None to leave the check to the server.
+            warmup: Resolve the API host in a background thread while the client
+                is set up. This only shortens the first request where lookups are
+                cached by the platform (e.g. a local caching resolver such as
+                systemd-resolved or nscd); the connection itself is still made by
+                the first request. Nothing is sent to the API.
+            query_cache_ttl: Answer a repeat of an identical query from memory for this
+                many seconds, keeping the 128 most recent results. Off by default,
+                since answers can change as documents are added.
 
         Raises:
             SensValidationError: If no API key is provided or found.
@@ -107,87 +478,182 @@ class SensClient:
 
         self.base_url = base_url.rstrip("/")
         self.timeout = timeout
+        self.requests_per_minute = requests_per_minute
+        self.max_retries = max_retries
+        self.backoff_cap = backoff_cap
+        self.document_cache_ttl = document_cache_ttl
+        self.max_upload_bytes = max_upload_bytes
+        # Document ID -> (expiry on the monotonic clock, Document)
+        self._doc_cache: Dict[str, Tuple[float, Document]] = {}
+        self.query_cache_ttl = query_cache_ttl
+        # Normalized query arguments -> (expiry on the monotonic clock, QueryResult),
+        # least recently used first.
+        self._query_cache: OrderedDict[Tuple[Any, ...], Tuple[float, QueryResult]] = OrderedDict()
+        self._headers = {
+            "Authorization": f"Bearer {self.api_key}",
+            "Accept": _ACCEPT,
+            "Content-Type": "application/json",
+            "User-Agent": "sens-prism-sdk/0.4.0",
+        }
         self._client = httpx.Client(
             headers=self._get_headers(),
             timeout=timeout,
+            http2=_HTTP2_AVAILABLE,
+            limits=_POOL_LIMITS,
         )
+        # Created on first use so it binds to the event loop that awaits it.
+        self._aclient: Optional[httpx.AsyncClient] = None
+
+        if warmup:
+            threading.Thread(target=self._warmup, daemon=True).start()
+
+    def _warmup(self) -> None:
+        """Resolve the API host ahead of the first request.
+
+        Best effort: a failed lookup is ignored and the first real request resolves
+        the host as usual.
+        """
+        url = httpx.URL(self.base_url)
+        port = url.port or (443 if url.scheme == "https" else 80)
+        try:
+            socket.getaddrinfo(url.host, port, type=socket.SOCK_STREAM)
+        except OSError:
+            pass
 
     def _get_headers(self) -> Dict[str, str]:
-        """Get default headers for requests."""
-        return {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json",
-            "User-Agent": "sens-prism-sdk/0.4.0",
-        }
+        """Get default headers for requests.
 
-    def _handle_response(self, response: httpx.Response) -> Dict[str, Any]:
+        Built once in ``__init__``; add new default headers there.
+        """
+        return self._headers
+
+    def _get_async_client(self) -> httpx.AsyncClient:
+        """Get the shared async HTTP client, creating it on first use."""
+        if self._aclient is None:
+            self._aclient = httpx.AsyncClient(
+                headers=self._get_headers(),
+                timeout=self.timeout,
+                http2=_HTTP2_AVAILABLE,
+                limits=_POOL_LIMITS,
+            )
+        return self._aclient
+
+    def _retry_delay(
+        self,
+        error: Union[SensRateLimitError, SensServiceUnavailableError],
+        attempt: int,
+        delays: Iterator[float],
+    ) -> Optional[float]:
+        """Get the wait before retrying a throttled request, or None to give up."""
+        if attempt >= self.max_retries:
+            return None
+        if error.retry_after is not None and error.retry_after > self.backoff_cap:
+            return None
+        return max(error.retry_after or 0, next(delays))
+
+    def _request(self, method: str, url: str, **kwargs: Any) -> Dict[str, Any]:
+        """Send a request, retrying with backoff while the API is throttling us.
+
+        429 and 503 responses are retried up to ``max_retries`` times, waiting at
+        least as long as the server's Retry-After asks.
+
+        Returns:
+            Parsed JSON response.
+
+        Raises:
+            SensError: For various API error conditions.
+        """
+        delays = _backoff_delays(max_delay=self.backoff_cap)
+        attempt = 0
+        while True:
+            response = self._client.request(method, url, **kwargs)
+            try:
+                return self._handle_response(response)
+            except (SensRateLimitError, SensServiceUnavailableError) as e:
+                delay = self._retry_delay(e, attempt, delays)
+                if delay is None:
+                    raise
+            time.sleep(delay)
+            attempt += 1
+
+    async def _arequest(self, method: str, url: str, **kwargs: Any) -> Dict[str, Any]:
+        """Async version of _request."""
+        delays = _backoff_delays(max_delay=self.backoff_cap)
+        attempt = 0
+        while True:
+            response = await self._get_async_client().request(method, url, **kwargs)
+            try:
+                return self._handle_response(response)
+            except (SensRateLimitError, SensServiceUnavailableError) as e:
+                delay = self._retry_delay(e, attempt, delays)
+                if delay is None:
+                    raise
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    @staticmethod
+    def _handle_response(response: httpx.Response) -> Dict[str, Any]:
         """Handle API response and raise exceptions for errors.
 
+        Only inspects the response, so it serves the sync and async clients alike.
+
         Args:
             response: The HTTP response object.
 
         Returns:
-            Parsed JSON response.
+            Parsed response body (JSON or MessagePack).
 
         Raises:
             SensError: For various API error conditions.
         """
         try:
-            data = response.json()
-        except Exception:
+            data = _decode_body(response)
+        except ValueError:
             data = {}
 
-        # Success responses
-        if response.status_code in (200, 201, 202, 204):
+        status_code = response.status_code
+        if 200 <= status_code < 300:
             return data
 
         # Error responses
-        error_message = data.get("message", f"HTTP {response.status_code}")
+        error_message = data.get("message", f"HTTP {status_code}")
         error_code = data.get("code")
         error_details = data.get("details", {})
 
-        if response.status_code == 400:
-            raise SensValidationError(
-                error_message, code=error_code, details=error_details
-            )
-        elif response.status_code == 401:
-            raise SensAuthError(
-                error_message, code=error_code, details=error_details
-            )
-        elif response.status_code == 403:
-            raise SensAuthError(
-                error_message, code=error_code, details=error_details
-            )
-        elif response.status_code == 404:
-            raise SensNotFoundError(
-                error_message, code=error_code, details=error_details
-            )
-        elif response.status_code == 409:
-            raise SensConflictError(
-                error_message, code=error_code, details=error_details
-            )
-        elif response.status_code == 413:
-            raise SensPayloadTooLargeError(
-                error_message, code=error_code, details=error_details
-            )
-        elif response.status_code == 429:
-            retry_after = response.headers.get("Retry-After")
-            raise SensRateLimitError(
+        exc_class = _STATUS_ERRORS.get(status_code)
+        if exc_class is not None:
+            raise exc_class(error_message, code=error_code, details=error_details)
+
+        exc_class = _RETRY_AFTER_ERRORS.get(status_code)
+        if exc_class is not None:
+            raise exc_class(
                 error_message,
                 code=error_code,
-                retry_after=int(retry_after) if retry_after else None,
+                retry_after=_parse_retry_after(response.headers.get("Retry-After")),
                 details=error_details,
             )
-        elif response.status_code == 503:
-            retry_after = response.headers.get("Retry-After")
-            raise SensServiceUnavailableError(
-                error_message,
-                retry_after=int(retry_after) if retry_after else None,
-                code=error_code,
-                details=error_details,
+
+        raise SensError(error_message, code=error_code, details=error_details)
+
+    def _check_upload(self, file_path: str) -> int:
+        """Validate a file before uploading it and return its size in bytes.
+
+        Raises:
+            SensValidationError: If file doesn't exist.
+            SensPayloadTooLargeError: If file exceeds max_upload_bytes.
+        """
+        try:
+            size = os.stat(file_path).st_size
+        except FileNotFoundError:
+            raise SensValidationError(f"File not found: {file_path}", code="SENS_003") from None
+
+        if self.max_upload_bytes is not None and size > self.max_upload_bytes:
+            raise SensPayloadTooLargeError(
+                f"File size exceeds {self.max_upload_bytes} byte limit: {file_path}",
+                code="SENS_007",
+                details={"size_bytes": size, "max_upload_bytes": self.max_upload_bytes},
             )
-        else:
-            raise SensError(error_message, code=error_code, details=error_details)
+        return size
 
     def upload_document(
         self,
@@ -209,39 +675,75 @@ class SensClient:
             SensValidationError: If file doesn't exist or format invalid.
             SensPayloadTooLargeError: If file exceeds size limits.
         """
-        if not os.path.exists(file_path):
-            raise SensValidationError(f"File not found: {file_path}", code="SENS_003")
+        size = self._check_upload(file_path)
+        body = _SyncMultipartBody(file_path, size, _build_upload_data(title, tags))
+        result = self._request(
+            "POST",
+            f"{self.base_url}/documents",
+            content=body,
+            headers=body.headers,
+        )
+        # A new document can change the answer to queries across all documents.
+        self._invalidate_queries()
+        return _parse_document(result)
 
-        with open(file_path, "rb") as f:
-            files = {"file": f}
-            data = {}
-            if title:
-                data["title"] = title
-            if tags:
-                data["tags"] = ",".join(tags)
-
-            response = self._client.post(
-                f"{self.base_url}/documents",
-                files=files,
-                data=data if data else None,
-            )
+    def upload_documents(
+        self,
+        file_paths: List[str],
+        tags: Optional[List[str]] = None,
+    ) -> List[Union[Document, Exception]]:
+        """Upload several documents over the client's kept-alive connection.
 
-        result = self._handle_response(response)
-        return Document(
-            id=result["id"],
-            status=result["status"],
-            title=result.get("title"),
-            size_bytes=result.get("size_bytes"),
-            tags=result.get("tags"),
-            created_at=result.get("created_at"),
-            estimated_ready_at=result.get("estimated_ready_at"),
-        )
+        A failed file doesn't stop the batch, so the documents that were created
+        are always reported back and can be used or deleted.
+
+        Args:
+            file_paths: Paths to document files. A directory uploads every file
+                directly inside it.
+            tags: Tags applied to every uploaded document.
 
-    def get_document(self, document_id: str) -> Document:
+        Returns:
+            One entry per file in upload order: its Document, or the exception
+            (e.g. SensValidationError, SensPayloadTooLargeError) its upload raised.
+        """
+        paths = []
+        for file_path in file_paths:
+            if os.path.isdir(file_path):
+                paths.extend(
+                    entry.path
+                    for entry in sorted(os.scandir(file_path), key=lambda e: e.name)
+                    if entry.is_file()
+                )
+            else:
+                paths.append(file_path)
+
+        results: List[Union[Document, Exception]] = []
+        for path in paths:
+            try:
+                results.append(self.upload_document(path, tags=tags))
+            except Exception as e:
+                results.append(e)
+        return results
+
+    def _cache_document(self, document: Document) -> None:
+        """Remember a ready document, or forget a document that isn't ready.
+
+        Only ready documents are cached: anything still processing must be fetched
+        fresh so pollers see its status change.
+        """
+        if document.status == _READY and self.document_cache_ttl > 0:
+            expires_at = time.monotonic() + self.document_cache_ttl
+            self._doc_cache[document.id] = (expires_at, document)
+        else:
+            self._doc_cache.pop(document.id, None)
+
+    def get_document(self, document_id: str, use_cache: bool = True) -> Document:
         """Get document metadata and status.
 
         Args:
             document_id: The document ID (from upload_document response)
+            use_cache: Return a ready document seen within ``document_cache_ttl``
+                without a round-trip. Pass False to always ask the server.
 
         Returns:
             Document object with current status.
@@ -249,21 +751,77 @@ class SensClient:
         Raises:
             SensNotFoundError: If document doesn't exist.
         """
-        response = self._client.get(f"{self.base_url}/documents/{document_id}")
-        result = self._handle_response(response)
-
-        return Document(
-            id=result["id"],
-            status=result["status"],
-            title=result.get("title"),
-            size_bytes=result.get("size_bytes"),
-            tags=result.get("tags"),
-            created_at=result.get("created_at"),
-            ready_at=result.get("ready_at"),
-            page_count=result.get("page_count"),
-            chunk_count=result.get("chunk_count"),
-            concept_count=result.get("concept_count"),
-        )
+        if use_cache:
+            cached = self._doc_cache.get(document_id)
+            if cached is not None and time.monotonic() < cached[0]:
+                return cached[1]
+
+        result = self._request("GET", f"{self.base_url}/documents/{document_id}")
+        document = _parse_document(result)
+        self._cache_document(document)
+        return document
+
+    def wait_for_document(
+        self,
+        document_id: str,
+        timeout: float = 60.0,
+        poll_interval: Optional[float] = None,
+        initial_delay: float = 0.5,
+        max_delay: float = 8.0,
+    ) -> Document:
+        """Block until a document is ready or failed, or until timeout elapses.
+
+        Each request asks the server to hold the connection (``?wait=N``) until the
+        document status changes, so a typical wait costs a single round-trip. If the
+        server answers early without a status change, it does not support long-polling
+        and the client falls back to polling with capped exponential backoff.
+
+        Args:
+            document_id: The document ID (from upload_document response)
+            timeout: Maximum number of seconds to wait.
+            poll_interval: Fixed delay between fallback polls. If omitted, uses
+                exponential backoff from ``initial_delay`` up to ``max_delay``.
+            initial_delay: First fallback backoff delay in seconds; each later
+                delay doubles it.
+            max_delay: Longest fallback backoff delay in seconds.
+
+        Returns:
+            Document object in its latest state. Check ``status`` to tell whether
+            processing finished or the timeout was reached.
+
+        Raises:
+            SensNotFoundError: If document doesn't exist.
+        """
+        deadline = time.monotonic() + timeout
+        if poll_interval is None:
+            delays = _backoff_delays(initial_delay, max_delay)
+        else:
+            delays = itertools.repeat(poll_interval)
+
+        while True:
+            wait = max(0, min(_MAX_SERVER_WAIT, int(deadline - time.monotonic())))
+            started = time.monotonic()
+            result = self._request(
+                "GET",
+                f"{self.base_url}/documents/{document_id}",
+                params={"wait": wait},
+                timeout=self._long_poll_timeout(wait),
+            )
+            document = _parse_document(result)
+            self._cache_document(document)
+
+            now = time.monotonic()
+            if document.status in _TERMINAL_STATUSES or now >= deadline:
+                return document
+            if wait == 0 or now - started < wait:
+                # Answered before the wait elapsed with nothing new to report, so the
+                # server is not long-polling; back off before asking again.
+                time.sleep(min(next(delays), deadline - now))
+
+    def _long_poll_timeout(self, wait: int) -> httpx.Timeout:
+        """Get request timeouts for a long-poll that the server may hold for ``wait`` seconds."""
+        # The read timeout must outlast the time the server holds the request.
+        return httpx.Timeout(self.timeout, connect=5.0, read=max(self.timeout, wait + 5))
 
     def delete_document(self, document_id: str) -> None:
         """Delete a document. This action is permanent.
@@ -274,8 +832,61 @@ class SensClient:
         Raises:
             SensNotFoundError: If document doesn't exist.
         """
-        response = self._client.delete(f"{self.base_url}/documents/{document_id}")
-        self._handle_response(response)
+        try:
+            self._request("DELETE", f"{self.base_url}/documents/{document_id}")
+        finally:
+            # Forget the document even if the delete failed: a 404 means it is
+            # already gone, and otherwise the next read just goes to the server.
+            self._doc_cache.pop(document_id, None)
+            self._invalidate_queries(document_id)
+
+    @staticmethod
+    def _query_cache_key(
+        query: str,
+        document_ids: Optional[List[str]],
+        tags: Optional[List[str]],
+        limit: int,
+        confidence_threshold: float,
+        include_context_rail: bool,
+    ) -> Tuple[Any, ...]:
+        """Normalize query arguments into a hashable cache key."""
+        return (
+            query,
+            tuple(document_ids) if document_ids else None,
+            tuple(tags) if tags else None,
+            limit,
+            confidence_threshold,
+            include_context_rail,
+        )
+
+    def _get_cached_query(self, key: Tuple[Any, ...]) -> Optional[QueryResult]:
+        """Get an unexpired cached query result, if there is one."""
+        cached = self._query_cache.get(key)
+        if cached is None:
+            return None
+        if time.monotonic() >= cached[0]:
+            del self._query_cache[key]
+            return None
+        self._query_cache.move_to_end(key)
+        return cached[1]
+
+    def _cache_query(self, key: Tuple[Any, ...], result: QueryResult) -> None:
+        """Remember a query result, evicting the least recently used beyond the limit."""
+        self._query_cache[key] = (time.monotonic() + self.query_cache_ttl, result)
+        self._query_cache.move_to_end(key)
+        while len(self._query_cache) > _QUERY_CACHE_SIZE:
+            self._query_cache.popitem(last=False)
+
+    def _invalidate_queries(self, document_id: Optional[str] = None) -> None:
+        """Drop cached queries whose answer may change with a document's arrival or removal.
+
+        Queries across all documents are always dropped. Queries scoped to specific
+        documents are dropped only if they include ``document_id``.
+        """
+        for key in list(self._query_cache):
+            document_ids = key[1]
+            if document_ids is None or document_id in document_ids:
+                del self._query_cache[key]
 
     def query(
         self,
@@ -284,6 +895,8 @@ class SensClient:
         tags: Optional[List[str]] = None,
         limit: int = 3,
         confidence_threshold: float = 0.5,
+        include_context_rail: bool = False,
+        use_cache: bool = True,
     ) -> QueryResult:
         """Query your knowledge base.
 
@@ -293,55 +906,46 @@ class SensClient:
             tags: Filter documents by tags.
             limit: Maximum number of source chunks to include.
             confidence_threshold: Minimum confidence score (0.0-1.0).
+            include_context_rail: Have the server embed the full Context Rail in
+                the response, saving a separate get_context_rail round-trip.
+            use_cache: Reuse the result of an identical query made within
+                ``query_cache_ttl``. Pass False to always ask the server.
 
         Returns:
-            QueryResult with answer and sources.
+            QueryResult with answer and sources, plus ``context_rail`` when requested.
 
         Raises:
             SensValidationError: If query parameters are invalid.
             SensConflictError: If a document is still processing.
         """
-        payload = {
-            "query": query,
-            "limit": limit,
-            "confidence_threshold": confidence_threshold,
-        }
-
-        if document_ids:
-            payload["document_ids"] = document_ids
-        if tags:
-            payload["tags"] = tags
-
-        response = self._client.post(
-            f"{self.base_url}/query",
-            json=payload,
-        )
-
-        result = self._handle_response(response)
-
-        sources = [
-            Source(
-                document_id=s["document_id"],
-                document_title=s.get("document_title"),
-                page=s.get("page"),
-                confidence_score=s.get("confidence_score"),
+        use_cache = use_cache and self.query_cache_ttl > 0
+        if use_cache:
+            key = self._query_cache_key(
+                query, document_ids, tags, limit, confidence_threshold, include_context_rail
             )
-            for s in result.get("sources", [])
-        ]
+            cached = self._get_cached_query(key)
+            if cached is not None:
+                return cached
 
-        return QueryResult(
-            query_id=result["query_id"],
-            query=result["query"],
-            answer=result["answer"],
-            confidence_score=result["confidence_score"],
-            processing_time_ms=result["processing_time_ms"],
-            sources=sources,
+        payload = _build_query_payload(
+            query, document_ids, tags, limit, confidence_threshold, include_context_rail
+        )
+        result = self._request(
+            "POST",
+            f"{self.base_url}/query",
+            content=_json_dumps(payload),
         )
+        query_result = _parse_query_result(result)
+        if use_cache:
+            self._cache_query(key, query_result)
+        return query_result
 
     def get_context_rail(self, query_id: str) -> ContextRail:
         """Get detailed context information for a query.
 
         Includes excerpts, page numbers, semantic layers, and confidence scores.
+        Queries made with ``include_context_rail=True`` already carry this as
+        ``QueryResult.context_rail``; this call is the fallback for those that don't.
 
         Args:
             query_id: The query ID (from query response).
@@ -352,30 +956,8 @@ class SensClient:
         Raises:
             SensNotFoundError: If query doesn't exist or has expired.
         """
-        response = self._client.get(f"{self.base_url}/context-rail/{query_id}")
-        result = self._handle_response(response)
-
-        sources = [
-            Source(
-                document_id=s["document_id"],
-                document_title=s.get("document_title"),
-                page=s.get("page"),
-                excerpt=s.get("excerpt"),
-                confidence_score=s.get("confidence_score"),
-                semantic_layer=s.get("semantic_layer"),
-                matched_concepts=s.get("matched_concepts"),
-                pragmatic_insights=s.get("pragmatic_insights"),
-            )
-            for s in result.get("sources", [])
-        ]
-
-        return ContextRail(
-            query_id=result["query_id"],
-            query=result["query"],
-            retrieved_at=result["retrieved_at"],
-            sources=sources,
-            summary=result.get("summary", {}),
-        )
+        result = self._request("GET", f"{self.base_url}/context-rail/{query_id}")
+        return _parse_context_rail(result)
 
     async def upload_document_async(
         self,
@@ -384,10 +966,97 @@ class SensClient:
         tags: Optional[List[str]] = None,
     ) -> Document:
         """Async version of upload_document."""
-        loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(
-            None, self.upload_document, file_path, title, tags
+        # os.stat can block on slow or network filesystems; keep it off the event loop.
+        size = await asyncio.to_thread(self._check_upload, file_path)
+        body = _AsyncMultipartBody(file_path, size, _build_upload_data(title, tags))
+        result = await self._arequest(
+            "POST",
+            f"{self.base_url}/documents",
+            content=body,
+            headers=body.headers,
         )
+        # A new document can change the answer to queries across all documents.
+        self._invalidate_queries()
+        return _parse_document(result)
+
+    async def get_document_async(self, document_id: str, use_cache: bool = True) -> Document:
+        """Async version of get_document."""
+        if use_cache:
+            cached = self._doc_cache.get(document_id)
+            if cached is not None and time.monotonic() < cached[0]:
+                return cached[1]
+
+        result = await self._arequest("GET", f"{self.base_url}/documents/{document_id}")
+        document = _parse_document(result)
+        self._cache_document(document)
+        return document
+
+    async def wait_for_document_async(
+        self,
+        document_id: str,
+        timeout: float = 60.0,
+        poll_interval: Optional[float] = None,
+        initial_delay: float = 0.5,
+        max_delay: float = 8.0,
+    ) -> Document:
+        """Async version of wait_for_document."""
+        deadline = time.monotonic() + timeout
+        if poll_interval is None:
+            delays = _backoff_delays(initial_delay, max_delay)
+        else:
+            delays = itertools.repeat(poll_interval)
+
+        while True:
+            wait = max(0, min(_MAX_SERVER_WAIT, int(deadline - time.monotonic())))
+            started = time.monotonic()
+            result = await self._arequest(
+                "GET",
+                f"{self.base_url}/documents/{document_id}",
+                params={"wait": wait},
+                timeout=self._long_poll_timeout(wait),
+            )
+            document = _parse_document(result)
+            self._cache_document(document)
+
+            now = time.monotonic()
+            if document.status in _TERMINAL_STATUSES or now >= deadline:
+                return document
+            if wait == 0 or now - started < wait:
+                await asyncio.sleep(min(next(delays), deadline - now))
+
+    async def upload_and_wait(
+        self,
+        file_path: str,
+        title: Optional[str] = None,
+        tags: Optional[List[str]] = None,
+        timeout: float = 60.0,
+    ) -> Document:
+        """Upload a document and wait for it to finish processing.
+
+        A single awaitable per file, so many uploads can run together. With room for
+        every file at once, e.g.
+        ``await client.gather_with_limit((client.upload_and_wait(p) for p in paths),
+        limit=len(paths))``, a batch takes about as long as its slowest document.
+        A smaller limit holds each slot for a whole upload plus its wait.
+
+        Args:
+            file_path: Path to the document file (PDF, DOCX, TXT, RTF)
+            title: Human-readable document name
+            tags: List of tags for organization (e.g., ["legal", "contract"])
+            timeout: Maximum number of seconds to wait after the upload.
+
+        Returns:
+            Document object in its latest state. Check ``status`` to tell whether
+            processing finished or the timeout was reached.
+
+        Raises:
+            SensValidationError: If file doesn't exist or format invalid.
+            SensPayloadTooLargeError: If file exceeds size limits.
+        """
+        document = await self.upload_document_async(file_path, title=title, tags=tags)
+        if document.status in _TERMINAL_STATUSES:
+            return document
+        return await self.wait_for_document_async(document.id, timeout=timeout)
 
     async def query_async(
         self,
@@ -396,23 +1065,79 @@ class SensClient:
         tags: Optional[List[str]] = None,
         limit: int = 3,
         confidence_threshold: float = 0.5,
+        include_context_rail: bool = False,
+        use_cache: bool = True,
     ) -> QueryResult:
         """Async version of query."""
-        loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(
-            None,
-            self.query,
-            query,
-            document_ids,
-            tags,
-            limit,
-            confidence_threshold,
+        use_cache = use_cache and self.query_cache_ttl > 0
+        if use_cache:
+            key = self._query_cache_key(
+                query, document_ids, tags, limit, confidence_threshold, include_context_rail
+            )
+            cached = self._get_cached_query(key)
+            if cached is not None:
+                return cached
+
+        payload = _build_query_payload(
+            query, document_ids, tags, limit, confidence_threshold, include_context_rail
         )
+        result = await self._arequest(
+            "POST",
+            f"{self.base_url}/query",
+            content=_json_dumps(payload),
+        )
+        query_result = _parse_query_result(result)
+        if use_cache:
+            self._cache_query(key, query_result)
+        return query_result
+
+    async def gather_with_limit(
+        self,
+        aws: Iterable[Awaitable[Any]],
+        limit: Optional[int] = None,
+    ) -> List[Any]:
+        """Await many requests with at most ``limit`` in flight at once.
+
+        This bounds concurrency, not rate: calls are started as soon as a slot is
+        free, so a batch needing more requests than the plan allows per minute is
+        still throttled. Throttled requests are retried by the client itself once
+        Retry-After has passed (see ``max_retries``).
+
+        Args:
+            aws: Awaitables to run, e.g. ``client.query_async(...)`` coroutines.
+            limit: Maximum number of awaitables running at once. Defaults to
+                ``requests_per_minute``. The limit counts awaitables, not HTTP
+                requests: each holds its slot until it finishes, so an
+                ``upload_and_wait`` occupies one for its upload and its whole wait.
+
+        Returns:
+            Results in the same order as ``aws``. Failed calls are returned as
+            their exception instead of being raised.
+        """
+        if limit is None:
+            limit = max(1, self.requests_per_minute)
+        semaphore = asyncio.Semaphore(limit)
+
+        async def _bounded(aw: Awaitable[Any]) -> Any:
+            async with semaphore:
+                return await aw
+
+        return await asyncio.gather(*(_bounded(aw) for aw in aws), return_exceptions=True)
 
     def close(self) -> None:
         """Close the HTTP client connection."""
         self._client.close()
 
+    async def aclose(self) -> None:
+        """Close the async HTTP client connection.
+
+        A new async client is created if async methods are called again afterwards,
+        e.g. from a later ``asyncio.run()``.
+        """
+        if self._aclient is not None:
+            await self._aclient.aclose()
+            self._aclient = None
+
     def __enter__(self):
         """Context manager entry."""
         return self
@@ -420,3 +1145,12 @@ class SensClient:
     def __exit__(self, exc_type, exc_val, exc_tb):
         """Context manager exit."""
         self.close()
+
+    async def __aenter__(self):
+        """Async context manager entry."""
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Async context manager exit."""
+        await self.aclose()
+        self.close()
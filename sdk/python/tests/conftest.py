@@ -0,0 +1,69 @@
+"""Shared fixtures for the Sens Prism SDK tests."""
+
+from typing import Callable, List, Union
+
+import httpx
+import pytest
+
+import sens.client
+from sens import SensClient
+
+BASE_URL = "https://api.test.sens.ai/v1"
+
+
+class FakeAPI:
+    """Stands in for the Sens Prism API.
+
+    Tests queue up ``responses`` (an httpx.Response, or a callable taking the
+    request and returning one), which are served in order. Every request the
+    client sends is recorded in ``requests``, with its body already read.
+    """
+
+    def __init__(self):
+        self.responses: List[Union[httpx.Response, Callable[[httpx.Request], httpx.Response]]] = []
+        self.requests: List[httpx.Request] = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        response = self.responses.pop(0)
+        return response(request) if callable(response) else response
+
+
+class FakeClock:
+    """Replaces the ``time`` module in sens.client: time only passes when slept."""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps: List[float] = []
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def api():
+    """A FakeAPI with nothing queued."""
+    return FakeAPI()
+
+
+@pytest.fixture
+def client(api):
+    """A SensClient whose sync and async requests are answered by ``api``."""
+    client = SensClient(api_key="sens_sk_test123", base_url=BASE_URL)
+    transport = httpx.MockTransport(api)
+    client._client = httpx.Client(transport=transport, headers=client._get_headers())
+    client._aclient = httpx.AsyncClient(transport=transport, headers=client._get_headers())
+    yield client
+    client.close()
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """A FakeClock installed in sens.client, so retries and polling don't really sleep."""
+    clock = FakeClock()
+    monkeypatch.setattr(sens.client, "time", clock)
+    return clock
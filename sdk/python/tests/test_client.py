@@ -0,0 +1,1023 @@
+"""Tests for sens.client."""
+
+import asyncio
+import json
+import socket
+import sys
+import threading
+from datetime import datetime, timedelta, timezone
+from email.parser import BytesParser
+from email.utils import format_datetime
+
+import httpx
+import pytest
+
+import sens.client
+from sens import SensClient
+from sens.client import ContextRail, Document, QueryResult, Source
+from sens.exceptions import (
+    SensAuthError,
+    SensConflictError,
+    SensError,
+    SensNotFoundError,
+    SensPayloadTooLargeError,
+    SensRateLimitError,
+    SensServiceUnavailableError,
+    SensValidationError,
+)
+
+
+def document_response(document_id="doc_1a2b3c4d5e", status="ready"):
+    """Build a GET /documents/{id} response."""
+    return httpx.Response(200, json={"id": document_id, "status": status, "title": "Contract"})
+
+
+def query_response(query_id="qry_xyz789", **extra):
+    """Build a POST /query response."""
+    body = {
+        "query_id": query_id,
+        "query": "What are the payment terms?",
+        "answer": "Net 30.",
+        "confidence_score": 0.94,
+        "processing_time_ms": 120,
+        "sources": [
+            {"document_id": "doc_1a2b3c4d5e", "page": 3, "confidence_score": 0.94},
+        ],
+    }
+    body.update(extra)
+    return httpx.Response(200, json=body)
+
+
+def test_client_initialization():
+    """Test that client initializes correctly."""
+    client = SensClient(api_key="sens_sk_test123")
+    assert client.api_key == "sens_sk_test123"
+    assert client.max_retries == 3
+
+
+def test_missing_api_key_raises_error(monkeypatch):
+    """Test that missing API key raises error."""
+    monkeypatch.delenv("SENS_API_KEY", raising=False)
+    with pytest.raises(SensValidationError):
+        SensClient()
+
+
+# Retries
+
+
+def test_rate_limited_request_is_retried_after_retry_after(client, api, clock):
+    """Test that a 429 is retried once Retry-After has passed."""
+    api.responses = [
+        httpx.Response(429, json={"message": "Slow down"}, headers={"Retry-After": "2"}),
+        document_response(),
+    ]
+
+    document = client.get_document("doc_1a2b3c4d5e")
+
+    assert document.status == "ready"
+    assert len(api.requests) == 2
+    assert clock.sleeps == [2]
+
+
+def test_unavailable_request_is_retried_with_backoff(client, api, clock):
+    """Test that a 503 without Retry-After waits a jittered backoff delay."""
+    api.responses = [httpx.Response(503), document_response()]
+
+    client.get_document("doc_1a2b3c4d5e")
+
+    assert len(clock.sleeps) == 1
+    assert 0.4 <= clock.sleeps[0] <= 0.6
+
+
+def test_retries_give_up_after_max_retries(client, api, clock):
+    """Test that the last throttled response is raised once retries run out."""
+    api.responses = [httpx.Response(429, json={"message": "Slow down"}) for _ in range(4)]
+
+    with pytest.raises(SensRateLimitError):
+        client.get_document("doc_1a2b3c4d5e")
+
+    assert len(api.requests) == 4
+    assert len(clock.sleeps) == 3
+
+
+def test_retries_disabled(client, api, clock):
+    """Test that max_retries=0 raises the first throttled response."""
+    client.max_retries = 0
+    api.responses = [httpx.Response(503)]
+
+    with pytest.raises(SensServiceUnavailableError):
+        client.get_document("doc_1a2b3c4d5e")
+
+    assert len(api.requests) == 1
+    assert clock.sleeps == []
+
+
+def test_retry_after_beyond_backoff_cap_is_raised(client, api, clock):
+    """Test that a Retry-After longer than backoff_cap is raised instead of slept."""
+    api.responses = [httpx.Response(429, headers={"Retry-After": "3600"})]
+
+    with pytest.raises(SensRateLimitError) as exc_info:
+        client.get_document("doc_1a2b3c4d5e")
+
+    assert exc_info.value.retry_after == 3600
+    assert clock.sleeps == []
+
+
+@pytest.mark.parametrize(
+    "header, expected",
+    [
+        ("1.5", 2),
+        ("0", 0),
+        ("soon", None),
+        (format_datetime(datetime.now(timezone.utc) - timedelta(minutes=5), usegmt=True), 0),
+    ],
+)
+def test_retry_after_parsing(client, api, header, expected):
+    """Test that Retry-After is read as delay-seconds or an HTTP-date."""
+    client.max_retries = 0
+    api.responses = [httpx.Response(429, headers={"Retry-After": header})]
+
+    with pytest.raises(SensRateLimitError) as exc_info:
+        client.get_document("doc_1a2b3c4d5e")
+
+    assert exc_info.value.retry_after == expected
+
+
+def test_retry_after_http_date_in_the_future(client, api):
+    """Test that an HTTP-date Retry-After becomes the seconds left until then."""
+    client.max_retries = 0
+    retry_at = datetime.now(timezone.utc) + timedelta(minutes=2)
+    api.responses = [
+        httpx.Response(429, headers={"Retry-After": format_datetime(retry_at, usegmt=True)})
+    ]
+
+    with pytest.raises(SensRateLimitError) as exc_info:
+        client.get_document("doc_1a2b3c4d5e")
+
+    assert 118 <= exc_info.value.retry_after <= 120
+
+
+async def test_async_request_is_retried(client, api):
+    """Test that async requests retry throttled responses too."""
+    client.backoff_cap = 0.01
+    api.responses = [httpx.Response(503), document_response()]
+
+    document = await client.get_document_async("doc_1a2b3c4d5e")
+
+    assert document.status == "ready"
+    assert len(api.requests) == 2
+
+
+# Waiting for documents
+
+
+def test_wait_for_document_long_polls(client, api, clock):
+    """Test that a server holding the request is asked again without sleeping."""
+
+    def held(request):
+        clock.now += int(request.url.params["wait"])
+        return document_response(status="processing")
+
+    api.responses = [held, document_response(status="ready")]
+
+    document = client.wait_for_document("doc_1a2b3c4d5e", timeout=60)
+
+    assert document.status == "ready"
+    assert api.requests[0].url.params["wait"] == "30"
+    assert api.requests[0].extensions["timeout"]["read"] == 35
+    assert clock.sleeps == []
+
+
+def test_wait_for_document_falls_back_to_backoff(client, api, clock):
+    """Test that an immediate answer without a status change backs off before polling again."""
+    api.responses = [
+        document_response(status="processing"),
+        document_response(status="processing"),
+        document_response(status="ready"),
+    ]
+
+    document = client.wait_for_document("doc_1a2b3c4d5e", timeout=60)
+
+    assert document.status == "ready"
+    assert len(api.requests) == 3
+    assert 0.4 <= clock.sleeps[0] <= 0.6
+    assert 0.8 <= clock.sleeps[1] <= 1.2
+
+
+def test_wait_for_document_uses_poll_interval(client, api, clock):
+    """Test that a fixed poll_interval replaces the backoff."""
+    api.responses = [document_response(status="processing"), document_response(status="failed")]
+
+    document = client.wait_for_document("doc_1a2b3c4d5e", timeout=60, poll_interval=2)
+
+    assert document.status == "failed"
+    assert clock.sleeps == [2]
+
+
+def test_wait_for_document_backoff_is_configurable(client, api, clock, monkeypatch):
+    """Test that initial_delay and max_delay shape the fallback backoff."""
+    monkeypatch.setattr("sens.client.random.uniform", lambda a, b: 1.0)
+    api.responses = [document_response(status="processing") for _ in range(4)]
+    api.responses.append(document_response(status="ready"))
+
+    client.wait_for_document("doc_1a2b3c4d5e", timeout=60, initial_delay=1, max_delay=3)
+
+    assert clock.sleeps == [1, 2, 3, 3]
+
+
+def test_wait_for_document_returns_on_timeout(client, api, clock):
+    """Test that the latest state is returned once the timeout elapses."""
+    api.responses = [document_response(status="processing") for _ in range(3)]
+
+    document = client.wait_for_document("doc_1a2b3c4d5e", timeout=1, poll_interval=0.5)
+
+    assert document.status == "processing"
+    assert len(api.requests) == 3
+    assert api.requests[0].url.params["wait"] == "1"
+
+
+# Async client
+
+
+async def test_query_async(client, api):
+    """Test that query_async sends the same request body as query."""
+    api.responses = [query_response()]
+
+    result = await client.query_async(
+        "What are the payment terms?", document_ids=["doc_1"], tags=["legal"], limit=5
+    )
+
+    assert result.answer == "Net 30."
+    assert result.sources[0].document_id == "doc_1a2b3c4d5e"
+    assert json.loads(api.requests[0].content) == {
+        "query": "What are the payment terms?",
+        "limit": 5,
+        "confidence_threshold": 0.5,
+        "document_ids": ["doc_1"],
+        "tags": ["legal"],
+    }
+
+
+async def test_async_client_is_created_once():
+    """Test that async methods share one AsyncClient until it is closed."""
+    client = SensClient(api_key="sens_sk_test123")
+
+    aclient = client._get_async_client()
+    assert client._get_async_client() is aclient
+
+    await client.aclose()
+    assert aclient.is_closed
+    assert client._get_async_client() is not aclient
+    await client.aclose()
+
+
+async def test_async_context_manager_closes_async_client(client, api):
+    """Test that leaving ``async with`` closes the async client."""
+    api.responses = [document_response()]
+
+    async with client:
+        await client.get_document_async("doc_1a2b3c4d5e")
+
+    assert client._aclient is None
+
+
+# Concurrency
+
+
+async def test_gather_with_limit_bounds_concurrency(client):
+    """Test that no more than ``limit`` awaitables run at once, and failures are returned."""
+    running = 0
+    peak = 0
+
+    async def call(i):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        if i == 3:
+            raise SensNotFoundError("Document not found")
+        return i
+
+    results = await client.gather_with_limit((call(i) for i in range(8)), limit=2)
+
+    assert peak == 2
+    assert results[:3] == [0, 1, 2]
+    assert isinstance(results[3], SensNotFoundError)
+    assert results[4:] == [4, 5, 6, 7]
+
+
+async def test_gather_with_limit_defaults_to_requests_per_minute(client):
+    """Test that the default limit is requests_per_minute awaitables in flight."""
+    client.requests_per_minute = 3
+    running = 0
+    peak = 0
+
+    async def call():
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+
+    await client.gather_with_limit(call() for _ in range(10))
+
+    assert peak == 3
+
+
+# Uploads
+
+
+def parse_multipart(request):
+    """Parse a multipart/form-data request body into {field name: (filename, payload)}."""
+    head = f"Content-Type: {request.headers['Content-Type']}\r\n\r\n".encode()
+    message = BytesParser().parsebytes(head + request.content)
+    return {
+        part.get_param("name", header="Content-Disposition"): (
+            part.get_param("filename", header="Content-Disposition"),
+            part.get_payload(decode=True),
+        )
+        for part in message.get_payload()
+    }
+
+
+def test_upload_document_streams_multipart_body(client, api, tmp_path):
+    """Test that uploads send a well-formed multipart body with an exact length."""
+    path = tmp_path / "contract.txt"
+    path.write_bytes(b"Payment is due within 30 days.")
+    api.responses = [document_response(status="processing")]
+
+    document = client.upload_document(str(path), title="Contract", tags=["legal", "2024"])
+
+    assert document.status == "processing"
+    request = api.requests[0]
+    assert request.headers["Content-Type"].startswith("multipart/form-data; boundary=")
+    assert int(request.headers["Content-Length"]) == len(request.content)
+    assert parse_multipart(request) == {
+        "title": (None, b"Contract"),
+        "tags": (None, b"legal,2024"),
+        "file": ("contract.txt", b"Payment is due within 30 days."),
+    }
+
+
+def test_upload_document_escapes_filename(client, api, tmp_path):
+    """Test that quotes and line breaks in a filename can't inject part headers."""
+    path = tmp_path / 'q3 "final"\r\nX-Injected: 1.txt'
+    path.write_bytes(b"data")
+    api.responses = [document_response(status="processing")]
+
+    client.upload_document(str(path))
+
+    content = api.requests[0].content
+    assert b"\r\nX-Injected" not in content
+    assert b'filename="q3 %22final%22%0D%0AX-Injected: 1.txt"' in content
+
+
+def test_upload_document_resends_body_on_retry(client, api, clock, tmp_path):
+    """Test that a retried upload sends the whole file again."""
+    path = tmp_path / "contract.txt"
+    path.write_bytes(b"x" * 200_000)
+    api.responses = [httpx.Response(503), document_response(status="processing")]
+
+    client.upload_document(str(path))
+
+    first, second = api.requests
+    assert len(second.content) == len(first.content) > 200_000
+    assert parse_multipart(second)["file"][1] == b"x" * 200_000
+
+
+async def test_upload_document_async_streams_multipart_body(client, api, tmp_path):
+    """Test that async uploads stream the same multipart body."""
+    path = tmp_path / "contract.txt"
+    path.write_bytes(b"Payment is due within 30 days.")
+    api.responses = [document_response(status="processing")]
+
+    await client.upload_document_async(str(path), title="Contract")
+
+    request = api.requests[0]
+    assert int(request.headers["Content-Length"]) == len(request.content)
+    assert parse_multipart(request)["file"] == ("contract.txt", b"Payment is due within 30 days.")
+
+
+def test_upload_documents_returns_partial_results(client, api, tmp_path):
+    """Test that one failed file doesn't lose the documents already created."""
+    path = tmp_path / "contract.txt"
+    path.write_bytes(b"data")
+    api.responses = [document_response(status="processing")]
+
+    results = client.upload_documents([str(path), str(tmp_path / "missing.pdf")])
+
+    assert isinstance(results[0], Document)
+    assert isinstance(results[1], SensValidationError)
+
+
+# Request encoding
+
+
+def test_default_headers_are_built_once(client, api):
+    """Test that every request carries the default headers, built once per client."""
+    assert client._get_headers() is client._get_headers()
+    api.responses = [document_response(), httpx.Response(204)]
+
+    client.get_document("doc_1a2b3c4d5e")
+    client.delete_document("doc_1a2b3c4d5e")
+
+    for request in api.requests:
+        assert request.headers["Authorization"] == "Bearer sens_sk_test123"
+        assert request.headers["User-Agent"] == "sens-prism-sdk/0.4.0"
+
+
+def test_query_body_is_utf8_json(client, api):
+    """Test that query bodies are JSON, whichever encoder is installed."""
+    api.responses = [query_response(answer="Netto 30 Tage, zahlbar in €.")]
+
+    result = client.query("Zahlungsbedingungen für Verträge?")
+
+    request = api.requests[0]
+    assert request.headers["Content-Type"] == "application/json"
+    assert (
+        json.loads(request.content.decode("utf-8"))["query"] == "Zahlungsbedingungen für Verträge?"
+    )
+    assert result.answer == "Netto 30 Tage, zahlbar in €."
+
+
+# Response parsing
+
+
+@pytest.mark.skipif(sys.version_info < (3, 10), reason="dataclass slots need Python 3.10")
+def test_result_dataclasses_have_slots():
+    """Test that result objects don't carry a per-instance __dict__."""
+    for cls in (Document, Source, QueryResult, ContextRail):
+        assert "__slots__" in vars(cls)
+    assert not hasattr(Source(document_id="doc_1a2b3c4d5e"), "__dict__")
+
+
+def test_sources_default_missing_fields(client, api):
+    """Test that optional source fields left out of a response are None, and extras are ignored."""
+    api.responses = [
+        query_response(
+            sources=[
+                {"document_id": "doc_1", "page": 3, "excerpt": "Net 30", "rank": 1},
+                {"document_id": "doc_2"},
+            ]
+        )
+    ]
+
+    first, second = client.query("What are the payment terms?").sources
+
+    assert (first.document_id, first.page, first.excerpt) == ("doc_1", 3, "Net 30")
+    assert first.document_title is None
+    assert second == Source(document_id="doc_2")
+
+
+def test_source_without_document_id_is_rejected(client, api):
+    """Test that a source missing its document_id fails loudly."""
+    api.responses = [query_response(sources=[{"page": 3}])]
+
+    with pytest.raises(KeyError):
+        client.query("What are the payment terms?")
+
+
+# Errors
+
+
+@pytest.mark.parametrize(
+    "status, exc_class",
+    [
+        (400, SensValidationError),
+        (401, SensAuthError),
+        (403, SensAuthError),
+        (404, SensNotFoundError),
+        (409, SensConflictError),
+        (413, SensPayloadTooLargeError),
+        (500, SensError),
+    ],
+)
+def test_error_statuses_raise_matching_exceptions(client, api, status, exc_class):
+    """Test that each error status maps to its exception, keeping message, code and details."""
+    api.responses = [
+        httpx.Response(
+            status,
+            json={"message": "Request failed", "code": "SENS_001", "details": {"field": "query"}},
+        )
+    ]
+
+    with pytest.raises(exc_class) as exc_info:
+        client.get_document("doc_1a2b3c4d5e")
+
+    assert type(exc_info.value) is exc_class
+    assert exc_info.value.message == "Request failed"
+    assert exc_info.value.code == "SENS_001"
+    assert exc_info.value.details == {"field": "query"}
+
+
+# Document cache
+
+
+def test_get_document_caches_ready_documents(client, api, clock):
+    """Test that a ready document is served from memory until document_cache_ttl passes."""
+    api.responses = [document_response(), document_response()]
+
+    first = client.get_document("doc_1a2b3c4d5e")
+    assert client.get_document("doc_1a2b3c4d5e") is first
+    assert len(api.requests) == 1
+
+    clock.now += 61
+    client.get_document("doc_1a2b3c4d5e")
+    assert len(api.requests) == 2
+
+
+def test_get_document_does_not_cache_processing_documents(client, api, clock):
+    """Test that documents still processing are always fetched fresh."""
+    api.responses = [document_response(status="processing"), document_response()]
+
+    client.get_document("doc_1a2b3c4d5e")
+    document = client.get_document("doc_1a2b3c4d5e")
+
+    assert document.status == "ready"
+    assert len(api.requests) == 2
+
+
+def test_get_document_use_cache_false(client, api, clock):
+    """Test that use_cache=False always asks the server."""
+    api.responses = [document_response(), document_response()]
+
+    client.get_document("doc_1a2b3c4d5e")
+    client.get_document("doc_1a2b3c4d5e", use_cache=False)
+
+    assert len(api.requests) == 2
+
+
+def test_delete_document_invalidates_document_cache(client, api, clock):
+    """Test that a deleted document is no longer served from memory."""
+    api.responses = [
+        document_response(),
+        httpx.Response(204),
+        httpx.Response(404, json={"message": "Document not found", "code": "SENS_404"}),
+    ]
+
+    client.get_document("doc_1a2b3c4d5e")
+    client.delete_document("doc_1a2b3c4d5e")
+
+    with pytest.raises(SensNotFoundError):
+        client.get_document("doc_1a2b3c4d5e")
+
+
+def test_failed_delete_invalidates_document_cache(client, api, clock):
+    """Test that a document already deleted elsewhere is not served from memory."""
+    not_found = {"message": "Document not found", "code": "SENS_404"}
+    api.responses = [
+        document_response(),
+        httpx.Response(404, json=not_found),
+        httpx.Response(404, json=not_found),
+    ]
+
+    client.get_document("doc_1a2b3c4d5e")
+    with pytest.raises(SensNotFoundError):
+        client.delete_document("doc_1a2b3c4d5e")
+
+    with pytest.raises(SensNotFoundError):
+        client.get_document("doc_1a2b3c4d5e")
+
+
+# Upload checks
+
+
+def test_upload_document_rejects_oversized_file(client, api, tmp_path):
+    """Test that files over max_upload_bytes are rejected before sending."""
+    client.max_upload_bytes = 3
+    path = tmp_path / "contract.txt"
+    path.write_bytes(b"data")
+
+    with pytest.raises(SensPayloadTooLargeError):
+        client.upload_document(str(path))
+
+    assert api.requests == []
+
+
+def test_upload_document_rejects_missing_file(client, api, tmp_path):
+    """Test that a missing file is reported before sending."""
+    with pytest.raises(SensValidationError, match="File not found"):
+        client.upload_document(str(tmp_path / "missing.pdf"))
+
+    assert api.requests == []
+
+
+def test_default_upload_limit_is_500_mb(client, tmp_path):
+    """Test that the default limit matches the documented 500 MB, not 500 MiB."""
+    path = tmp_path / "large.pdf"
+    with open(path, "wb") as f:
+        f.truncate(500_000_000)
+
+    assert client._check_upload(str(path)) == 500_000_000
+
+    with open(path, "r+b") as f:
+        f.truncate(500_000_001)
+    with pytest.raises(SensPayloadTooLargeError):
+        client._check_upload(str(path))
+
+
+# Document statuses
+
+
+def test_document_statuses_are_interned(client, api):
+    """Test that parsed statuses are the interned strings polling loops compare against."""
+    api.responses = [
+        httpx.Response(200, content=b'{"id": "doc_1", "status": "processing"}'),
+        httpx.Response(200, content=b'{"id": "doc_1", "status": "ready"}'),
+    ]
+
+    processing = client.get_document("doc_1")
+    ready = client.get_document("doc_1")
+
+    assert processing.status is sys.intern("processing")
+    assert ready.status is sens.client._READY
+
+
+# Warmup
+
+
+def test_warmup_resolves_host_in_background(monkeypatch):
+    """Test that warmup=True looks up the API host without sending a request."""
+    resolved = threading.Event()
+    lookups = []
+
+    def getaddrinfo(host, port, *args, **kwargs):
+        lookups.append((host, port))
+        resolved.set()
+        return []
+
+    monkeypatch.setattr(sens.client.socket, "getaddrinfo", getaddrinfo)
+    SensClient(api_key="sens_sk_test123", base_url="https://api.test.sens.ai/v1", warmup=True)
+
+    assert resolved.wait(timeout=5)
+    assert lookups == [("api.test.sens.ai", 443)]
+
+
+def test_warmup_ignores_lookup_failures(client, monkeypatch):
+    """Test that a failed lookup doesn't raise."""
+
+    def getaddrinfo(*args, **kwargs):
+        raise socket.gaierror("Name or service not known")
+
+    monkeypatch.setattr(sens.client.socket, "getaddrinfo", getaddrinfo)
+
+    client._warmup()
+
+
+def test_warmup_is_off_by_default(monkeypatch):
+    """Test that no lookup happens unless warmup is requested."""
+    lookups = []
+    monkeypatch.setattr(sens.client.socket, "getaddrinfo", lambda *a, **kw: lookups.append(a))
+
+    SensClient(api_key="sens_sk_test123")
+
+    assert lookups == []
+
+
+# Async document status
+
+
+async def test_get_document_async_caches_ready_documents(client, api):
+    """Test that get_document_async shares the document cache."""
+    api.responses = [document_response()]
+
+    first = await client.get_document_async("doc_1a2b3c4d5e")
+
+    assert client.get_document("doc_1a2b3c4d5e") is first
+    assert await client.get_document_async("doc_1a2b3c4d5e") is first
+    assert len(api.requests) == 1
+
+
+async def test_wait_for_document_async_falls_back_to_backoff(client, api):
+    """Test that wait_for_document_async long-polls and backs off like the sync version."""
+    api.responses = [document_response(status="processing"), document_response(status="ready")]
+
+    document = await client.wait_for_document_async(
+        "doc_1a2b3c4d5e", timeout=60, initial_delay=0.01, max_delay=0.01
+    )
+
+    assert document.status == "ready"
+    assert len(api.requests) == 2
+    assert api.requests[0].url.params["wait"] == "30"
+    assert api.requests[0].extensions["timeout"]["read"] == 35
+
+
+async def test_wait_for_document_async_returns_on_timeout(client, api):
+    """Test that the latest state is returned once the timeout elapses."""
+    api.responses = [document_response(status="processing")]
+
+    document = await client.wait_for_document_async("doc_1a2b3c4d5e", timeout=0)
+
+    assert document.status == "processing"
+    assert api.requests[0].url.params["wait"] == "0"
+
+
+async def test_upload_and_wait(client, api, tmp_path):
+    """Test that upload_and_wait uploads, then waits for the new document."""
+    path = tmp_path / "contract.txt"
+    path.write_bytes(b"data")
+
+    def held(request):
+        assert request.url.params["wait"] == "30"
+        return document_response(status="ready")
+
+    api.responses = [document_response(status="processing"), held]
+
+    document = await client.upload_and_wait(str(path), title="Contract", timeout=60)
+
+    assert document.status == "ready"
+    upload, status = api.requests
+    assert (upload.method, upload.url.path) == ("POST", "/v1/documents")
+    assert (status.method, status.url.path) == ("GET", "/v1/documents/doc_1a2b3c4d5e")
+
+
+async def test_upload_and_wait_returns_finished_upload(client, api, tmp_path):
+    """Test that no status check is made when the upload is already ready or failed."""
+    path = tmp_path / "contract.txt"
+    path.write_bytes(b"data")
+    api.responses = [document_response(status="failed")]
+
+    document = await client.upload_and_wait(str(path))
+
+    assert document.status == "failed"
+    assert len(api.requests) == 1
+
+
+# Context Rail
+
+
+def test_query_parses_sources_and_embedded_context_rail(client, api):
+    """Test that sources and an embedded Context Rail are parsed."""
+    api.responses = [
+        query_response(
+            context_rail={
+                "retrieved_at": "2025-02-14T10:00:00Z",
+                "sources": [{"document_id": "doc_1a2b3c4d5e", "excerpt": "Net 30"}],
+            }
+        )
+    ]
+
+    result = client.query("What are the payment terms?", include_context_rail=True)
+
+    assert json.loads(api.requests[0].content)["include_context_rail"] is True
+    assert result.sources[0].page == 3
+    assert result.sources[0].excerpt is None
+    assert result.context_rail.query_id == "qry_xyz789"
+    assert result.context_rail.sources[0].excerpt == "Net 30"
+
+
+def test_embedded_context_rail_without_retrieved_at(client, api):
+    """Test that an embedded rail leaving out retrieved_at is stamped with the response time."""
+    api.responses = [query_response(context_rail={"sources": [{"document_id": "doc_1a2b3c4d5e"}]})]
+    before = datetime.now(timezone.utc).replace(microsecond=0)
+
+    result = client.query("What are the payment terms?", include_context_rail=True)
+
+    retrieved_at = datetime.strptime(result.context_rail.retrieved_at, "%Y-%m-%dT%H:%M:%SZ")
+    assert before <= retrieved_at.replace(tzinfo=timezone.utc) <= datetime.now(timezone.utc)
+    assert result.context_rail.query == "What are the payment terms?"
+    assert result.context_rail.summary == {}
+
+
+def test_query_without_context_rail(client, api):
+    """Test that context_rail is None when the response has none."""
+    api.responses = [query_response()]
+
+    result = client.query("What are the payment terms?", include_context_rail=True)
+
+    assert result.context_rail is None
+
+
+def test_get_context_rail(client, api):
+    """Test that get_context_rail remains available for queries made without the flag."""
+    api.responses = [
+        httpx.Response(
+            200,
+            json={
+                "query_id": "qry_xyz789",
+                "query": "What are the payment terms?",
+                "retrieved_at": "2025-02-14T10:00:00Z",
+                "sources": [{"document_id": "doc_1a2b3c4d5e", "semantic_layer": "Concept"}],
+                "summary": {"total_sources": 1},
+            },
+        )
+    ]
+
+    rail = client.get_context_rail("qry_xyz789")
+
+    assert api.requests[0].url.path == "/v1/context-rail/qry_xyz789"
+    assert rail.sources[0].semantic_layer == "Concept"
+    assert rail.summary == {"total_sources": 1}
+
+
+# MessagePack
+
+
+def test_accepts_msgpack_when_installed(client, api):
+    """Test that MessagePack is preferred over JSON in the Accept header."""
+    pytest.importorskip("msgpack")
+    api.responses = [document_response()]
+
+    client.get_document("doc_1a2b3c4d5e")
+
+    assert api.requests[0].headers["Accept"] == "application/msgpack, application/json;q=0.9"
+
+
+def test_msgpack_response_is_decoded(client, api):
+    """Test that a MessagePack response body is decoded."""
+    msgpack = pytest.importorskip("msgpack")
+    body = msgpack.packb({"id": "doc_1a2b3c4d5e", "status": "ready", "page_count": 12})
+    api.responses = [
+        httpx.Response(200, content=body, headers={"Content-Type": "application/msgpack"})
+    ]
+
+    document = client.get_document("doc_1a2b3c4d5e")
+
+    assert document.status == "ready"
+    assert document.page_count == 12
+
+
+def test_msgpack_error_response_is_decoded(client, api):
+    """Test that errors sent as MessagePack keep their message and code."""
+    msgpack = pytest.importorskip("msgpack")
+    body = msgpack.packb({"message": "Document not found", "code": "SENS_404"})
+    api.responses = [
+        httpx.Response(404, content=body, headers={"Content-Type": "application/x-msgpack"})
+    ]
+
+    with pytest.raises(SensNotFoundError) as exc_info:
+        client.get_document("doc_1a2b3c4d5e")
+
+    assert exc_info.value.message == "Document not found"
+    assert exc_info.value.code == "SENS_404"
+
+
+def test_json_response_is_decoded_when_msgpack_is_accepted(client, api):
+    """Test that servers answering with JSON are still understood."""
+    api.responses = [
+        httpx.Response(
+            200,
+            content=b'{"id": "doc_1a2b3c4d5e", "status": "ready"}',
+            headers={"Content-Type": "application/json; charset=utf-8"},
+        )
+    ]
+
+    assert client.get_document("doc_1a2b3c4d5e").status == "ready"
+
+
+def test_undecodable_error_body_falls_back_to_status(client, api):
+    """Test that an error with an unreadable body still maps to its exception."""
+    api.responses = [
+        httpx.Response(404, content=b"\xc1", headers={"Content-Type": "application/msgpack"})
+    ]
+
+    with pytest.raises(SensNotFoundError, match="HTTP 404"):
+        client.get_document("doc_1a2b3c4d5e")
+
+
+# Async upload checks
+
+
+async def test_upload_document_async_checks_file_before_sending(client, api, tmp_path):
+    """Test that async uploads run the file check (in a worker thread) before sending."""
+    client.max_upload_bytes = 3
+    path = tmp_path / "contract.txt"
+    path.write_bytes(b"data")
+
+    with pytest.raises(SensValidationError, match="File not found"):
+        await client.upload_document_async(str(tmp_path / "missing.pdf"))
+    with pytest.raises(SensPayloadTooLargeError):
+        await client.upload_document_async(str(path))
+
+    assert api.requests == []
+
+
+# Confidence percentages
+
+
+@pytest.mark.parametrize(
+    "score, pct", [(0.94, 94), (0.29, 29), (0.005, 0), (1.0, 100), (None, None)]
+)
+def test_source_confidence_pct(score, pct):
+    """Test that confidence_pct is the confidence score as a rounded whole percentage."""
+    assert Source(document_id="doc_1a2b3c4d5e", confidence_score=score).confidence_pct == pct
+
+
+def test_parsed_sources_have_confidence_pct(client, api):
+    """Test that sources parsed from a response carry confidence_pct."""
+    api.responses = [query_response()]
+
+    result = client.query("What are the payment terms?")
+
+    assert result.sources[0].confidence_pct == 94
+
+
+# Query cache
+
+
+def test_query_cache_is_off_by_default(client, api):
+    """Test that identical queries both reach the server without query_cache_ttl."""
+    api.responses = [query_response(), query_response()]
+
+    client.query("What are the payment terms?")
+    client.query("What are the payment terms?")
+
+    assert len(api.requests) == 2
+
+
+def test_query_cache_reuses_identical_queries(client, api, clock):
+    """Test that an identical query is answered from memory until it expires."""
+    client.query_cache_ttl = 300
+    api.responses = [query_response(), query_response(), query_response()]
+
+    first = client.query("What are the payment terms?", document_ids=["doc_1"])
+    assert client.query("What are the payment terms?", document_ids=["doc_1"]) is first
+    assert len(api.requests) == 1
+
+    client.query("What are the payment terms?", document_ids=["doc_1"], limit=5)
+    assert len(api.requests) == 2
+
+    clock.now += 301
+    client.query("What are the payment terms?", document_ids=["doc_1"])
+    assert len(api.requests) == 3
+
+
+def test_query_cache_keeps_most_recent_results(client, api, clock):
+    """Test that the least recently used result is evicted beyond 128 entries."""
+    client.query_cache_ttl = 300
+    api.responses = [query_response() for _ in range(130)]
+
+    for i in range(129):
+        client.query(f"Question {i}")
+    client.query("Question 128")
+    assert len(api.requests) == 129
+
+    client.query("Question 0")
+    assert len(api.requests) == 130
+
+
+def test_upload_invalidates_unscoped_queries(client, api, clock, tmp_path):
+    """Test that an upload drops cached queries across all documents, but not scoped ones."""
+    client.query_cache_ttl = 300
+    path = tmp_path / "contract.txt"
+    path.write_bytes(b"data")
+    api.responses = [
+        query_response(),
+        query_response(),
+        document_response(status="processing"),
+        query_response(),
+    ]
+
+    client.query("What are the payment terms?")
+    client.query("What are the payment terms?", document_ids=["doc_1"])
+    client.upload_document(str(path))
+    client.query("What are the payment terms?")
+    client.query("What are the payment terms?", document_ids=["doc_1"])
+
+    assert len(api.requests) == 4
+    assert api.requests[-1].url.path == "/v1/query"
+    assert "document_ids" not in json.loads(api.requests[-1].content)
+
+
+def test_delete_invalidates_queries_on_that_document(client, api, clock):
+    """Test that a delete drops cached queries that include the deleted document."""
+    client.query_cache_ttl = 300
+    api.responses = [query_response(), query_response(), httpx.Response(204), query_response()]
+
+    client.query("What are the payment terms?", document_ids=["doc_1"])
+    client.query("What are the payment terms?", document_ids=["doc_2"])
+    client.delete_document("doc_1")
+    client.query("What are the payment terms?", document_ids=["doc_1"])
+    client.query("What are the payment terms?", document_ids=["doc_2"])
+
+    assert len(api.requests) == 4
+    assert json.loads(api.requests[-1].content)["document_ids"] == ["doc_1"]
+
+
+def test_query_cache_key_includes_tags(client, api, clock):
+    """Test that queries filtered by different tags are cached separately."""
+    client.query_cache_ttl = 300
+    api.responses = [query_response(), query_response()]
+
+    client.query("What are the payment terms?", tags=["legal"])
+    client.query("What are the payment terms?", tags=["legal"])
+    client.query("What are the payment terms?", tags=["finance"])
+
+    assert len(api.requests) == 2
+    assert json.loads(api.requests[1].content)["tags"] == ["finance"]
+
+
+async def test_query_async_shares_query_cache(client, api):
+    """Test that query_async reads and fills the same cache as query."""
+    client.query_cache_ttl = 300
+    api.responses = [query_response(), query_response()]
+
+    first = await client.query_async("What are the payment terms?", document_ids=["doc_1"])
+
+    assert client.query("What are the payment terms?", document_ids=["doc_1"]) is first
+    assert await client.query_async("What are the payment terms?", document_ids=["doc_1"]) is first
+    assert len(api.requests) == 1
+
+    await client.query_async("What are the payment terms?", document_ids=["doc_1"], use_cache=False)
+    assert len(api.requests) == 2